@@ -0,0 +1,495 @@
+import copy
+import hashlib
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+MATCH_COLUMNS = ['match_number', 'team1', 'team2', 'match_date', 'toss_winner', 'toss_decision', 'result', 'eliminator', 'winner', 'player_of_match', 'venue', 'city', 'team1_players', 'team2_players']
+TEAM_COLUMNS = ['team1', 'team2', 'winner', 'toss_winner']
+CATEGORY_COLUMNS = ['toss_decision', 'venue', 'city']
+REQUIRED_COLUMNS = ['team1', 'team2', 'toss_winner', 'toss_decision', 'result', 'venue', 'team1_players', 'team2_players']
+STRATEGIES = ['Bat First', 'Field First']
+EMPTY_ROWS = np.empty(0, dtype=np.int64)
+AGGREGATE_COLUMNS = {'toss_decisions': 'toss_decision', 'years': 'year', 'venues': 'venue', 'potm': 'player_of_match'}
+CACHE_DIR = '.cache'
+CACHE_VERSION = 1  # bump whenever clean_matches/encode_matches change what gets cached
+PLAYER_CACHE_VERSION = 1  # bump whenever split_squads or the PlayerIndex arrays change
+DROP_DIR = 'incoming'
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def clean_matches(raw):
+    df = raw.copy()
+    df['match_date'] = pd.to_datetime(df['match_date'], errors='coerce')
+    df['year'] = df['match_date'].dt.year
+    df['team1'], df['team2'], df['winner'] = df['team1'].str.strip(), df['team2'].str.strip(), df['winner'].str.strip()
+    return df[df['result'] == 'Win']
+
+
+def encode_matches(df):
+    """Integer-code the categorical columns; a no-op recode on frames that are already encoded."""
+    df = df.copy()
+    # one shared category set so team1/team2/winner/toss_winner codes are directly comparable
+    teams = sorted(set().union(*(df[col].dropna().astype(str).unique() for col in TEAM_COLUMNS)))
+    for col in TEAM_COLUMNS: df[col] = pd.Categorical(df[col], categories=teams)
+    for col in CATEGORY_COLUMNS: df[col] = df[col].astype('category')
+    return df
+
+
+def extend_categories(df, new):
+    """Encode new rows against df's categories, appending unseen labels so every existing code stays valid."""
+    df, new = df.copy(deep=False), new.copy()
+    for cols in [TEAM_COLUMNS] + [[col] for col in CATEGORY_COLUMNS]:
+        known = df[cols[0]].cat.categories
+        unseen = sorted(set(pd.concat([new[col] for col in cols]).dropna().astype(str)) - set(known))
+        for col in cols:
+            if unseen: df[col] = df[col].cat.add_categories(unseen)
+            new[col] = pd.Categorical(new[col], categories=df[col].cat.categories)
+    return df, new
+
+
+def validate_matches(raw, match_numbers):
+    """Check raw rows against the Match_Info.csv schema and the store's sorted match numbers; raises ValueError."""
+    missing, extra = [c for c in MATCH_COLUMNS if c not in raw.columns], [c for c in raw.columns if c not in MATCH_COLUMNS]
+    if missing or extra: raise ValueError(f"columns do not match Match_Info.csv (missing: {missing}, unexpected: {extra})")
+    numbers = pd.to_numeric(raw['match_number'], errors='coerce')
+    if numbers.isna().any() or (numbers % 1 != 0).any(): raise ValueError("match_number must be an integer on every row")
+    numbers = numbers.to_numpy().astype(np.int64)
+    repeated = pd.Series(numbers).duplicated().to_numpy()
+    if repeated.any(): raise ValueError(f"match_number {numbers[repeated][0]} appears more than once in the new rows")
+    if len(match_numbers):
+        # binary search against the sorted loaded numbers keeps this proportional to the new rows
+        at = np.minimum(np.searchsorted(match_numbers, numbers), len(match_numbers) - 1)
+        loaded = match_numbers[at] == numbers
+        if loaded.any(): raise ValueError(f"match_number {numbers[loaded][0]} is already loaded")
+    if pd.to_datetime(raw['match_date'], errors='coerce').isna().any(): raise ValueError("match_date could not be parsed on every row")
+    # a row cut short (e.g. read mid-copy) parses with its trailing fields missing
+    blank = [col for col in REQUIRED_COLUMNS if raw[col].isna().any()]
+    if blank: raise ValueError(f"{', '.join(blank)} must be set on every row")
+    return raw[MATCH_COLUMNS].assign(match_number=numbers)
+
+
+def count_values(col):
+    counts = col.value_counts()
+    counts = counts[counts > 0]
+    return pd.Series(counts.to_numpy(), index=pd.Index(counts.index.tolist(), name=col.name), name='count')
+
+
+def count_aggregates(df):
+    return {name: count_values(df[col]) for name, col in AGGREGATE_COLUMNS.items()}
+
+
+def merge_counts(totals, delta):
+    """Add the counts of newly appended rows into the running totals."""
+    return {name: totals[name].add(delta[name], fill_value=0).astype(np.int64).sort_values(ascending=False, kind='stable') for name in totals}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''): digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_cache(cache_path):
+    """Memory-map an Arrow IPC cache file; returns (table, fingerprint) or (None, None) if unreadable."""
+    try:
+        table = pa.ipc.open_file(pa.memory_map(cache_path)).read_all()
+        return table, json.loads(table.schema.metadata[b'source'])
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowInvalid):
+        return None, None
+
+
+def write_cache(cache_path, table, fingerprint):
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'source': json.dumps(fingerprint).encode()})
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer: writer.write_table(table)
+        os.replace(tmp_path, cache_path)  # readers never see a half-written cache
+    except OSError:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+
+
+def cached_matches(csv_path, cache_dir=CACHE_DIR):
+    """The cleaned, encoded matches as an mmap'd Arrow table, with the fingerprint it was cached under."""
+    cache_path = os.path.join(cache_dir, os.path.basename(csv_path) + '.arrow')
+    stat = os.stat(csv_path)
+    table, cached = read_cache(cache_path)
+    fingerprint = {'version': CACHE_VERSION, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    if table is not None and all(cached.get(k) == v for k, v in fingerprint.items()): return table, cached
+    # mtime/size moved: only the content hash (and the transform version) decide whether to rebuild
+    fingerprint['sha256'] = file_sha256(csv_path)
+    if table is None or any(cached.get(k) != fingerprint[k] for k in ('version', 'sha256')):
+        table = pa.Table.from_pandas(encode_matches(clean_matches(pd.read_csv(csv_path))), preserve_index=False)
+    write_cache(cache_path, table, fingerprint)
+    return table, fingerprint
+
+
+def load_matches(csv_path, cache_dir=CACHE_DIR):
+    """Cleaned, encoded matches from an mmap'd Arrow cache that is rebuilt only when the CSV changes."""
+    return cached_matches(csv_path, cache_dir)[0].to_pandas()
+
+
+def load_store(csv_path, cache_dir=CACHE_DIR):
+    """A MatchStore over load_matches, with its player index cached beside the matches under the same fingerprint."""
+    table, fingerprint = cached_matches(csv_path, cache_dir)
+    fingerprint = {**fingerprint, 'players_version': PLAYER_CACHE_VERSION}
+    df = table.to_pandas()
+    cache_path = os.path.join(cache_dir, os.path.basename(csv_path) + '.players.arrow')
+    players, cached = read_cache(cache_path)
+    if players is not None and cached == fingerprint: return MatchStore(df, PlayerIndex.from_table(players, len(df)))
+    store = MatchStore(df)
+    write_cache(cache_path, store.snapshot.player_index.to_table(), fingerprint)
+    return store
+
+
+class PostingIndex:
+    """Label -> sorted row ids, plus the per-row integer codes used to test membership of candidate rows."""
+
+    def __init__(self, *columns):
+        self.labels, self.code_of, self.postings = [], {}, {}
+        self.codes = [EMPTY_ROWS] * len(columns)
+        self.extend(*columns)
+
+    def extend(self, *columns):
+        """Index rows appended after the current ones; attributes are rebound, never mutated, so a copy can be extended."""
+        offset = len(self.codes[0])
+        unseen = sorted(set().union(*(pd.Series(c).dropna().unique() for c in columns)) - set(self.code_of))
+        self.code_of = {**self.code_of, **{label: len(self.labels) + i for i, label in enumerate(unseen)}}
+        self.labels = self.labels + unseen
+        # code the new rows against the shared labels; missing values stay at -1
+        new_codes = [pd.Categorical(c, categories=self.labels).codes.astype(np.int64) for c in columns]
+        per_column = []
+        for codes in new_codes:
+            order = np.argsort(codes, kind='stable') + offset
+            counts = np.bincount(codes[codes >= 0], minlength=len(self.labels))
+            per_column.append(np.split(order[(codes < 0).sum():], np.cumsum(counts)[:-1]))
+        postings = dict(self.postings)
+        # new row ids all follow the old ones, so appending keeps every posting list sorted
+        for label, *rows in zip(self.labels, *per_column):
+            rows = rows[0] if len(rows) == 1 else np.union1d(*rows)
+            if len(rows): postings[label] = np.concatenate([postings[label], rows]) if label in postings else rows
+        self.postings = postings
+        self.codes = [np.concatenate([old, new]) for old, new in zip(self.codes, new_codes)]
+
+    def covers(self, keys):
+        return not keys or set(self.postings) <= set(keys)
+
+    def size(self, keys):
+        return sum(len(self.postings[k]) for k in keys if k in self.postings)
+
+    def rows(self, keys):
+        parts = [self.postings[k] for k in keys if k in self.postings]
+        if len(parts) <= 1: return parts[0] if parts else EMPTY_ROWS
+        # scattering into a row bitmap beats sorting the concatenated posting lists
+        hit = np.zeros(len(self.codes[0]), dtype=bool)
+        for part in parts: hit[part] = True
+        return np.flatnonzero(hit)
+
+    def contains(self, rows, keys):
+        allowed = np.zeros(len(self.labels) + 1, dtype=bool)  # the extra slot is what code -1 indexes
+        allowed[[self.code_of[k] for k in keys if k in self.code_of]] = True
+        hit = allowed[self.codes[0][rows]]
+        for codes in self.codes[1:]: hit |= allowed[codes[rows]]
+        return hit
+
+
+def split_squads(col):
+    """Comma-separated squads -> (row position per name, trimmed names), split and trimmed in Arrow compute."""
+    squads = pc.split_pattern(pa.array(col, from_pandas=True), ',')
+    rows = np.repeat(np.arange(len(col)), pc.fill_null(pc.list_value_length(squads), 0).to_numpy())
+    return rows, pc.utf8_trim_whitespace(pc.list_flatten(squads))
+
+
+class PlayerIndex:
+    """Squad strings split once into interned player ids, with one integer row per (player, match) appearance."""
+
+    def __init__(self, df):
+        self.players = pd.Index([], dtype=object)
+        self.player, self.row, self.team = np.empty(0, dtype=np.int32), EMPTY_ROWS, np.empty(0, dtype=np.int16)
+        self.season, self.won, self.potm = np.empty(0, dtype=df['year'].dtype), np.empty(0, dtype=bool), np.empty(0, dtype=bool)
+        self.offsets, self.n_rows = np.zeros(1, dtype=np.int64), 0
+        self.extend(df)
+
+    @classmethod
+    def from_table(cls, table, n_rows):
+        """Rebuild an index from to_table's output, skipping the squad split entirely."""
+        index = cls.__new__(cls)
+        player = table['player'].combine_chunks()
+        index.players = pd.Index(player.dictionary.to_pylist())
+        index.player = player.indices.to_numpy()
+        for name in ('row', 'team', 'season', 'won', 'potm'): setattr(index, name, table[name].to_numpy())
+        index.offsets = np.concatenate([[0], np.cumsum(np.bincount(index.player, minlength=len(index.players)))])
+        index.n_rows = n_rows
+        return index
+
+    def to_table(self):
+        """The appearance arrays as an Arrow table; player is dictionary-encoded so the interned names travel with it."""
+        player = pa.DictionaryArray.from_arrays(self.player, pa.array(self.players, type=pa.string()))
+        return pa.table({'player': player, **{name: getattr(self, name) for name in ('row', 'team', 'season', 'won', 'potm')}})
+
+    def extend(self, df, offset=0):
+        """Add the appearances of df (positionally indexed, starting at store row offset); attributes are rebound."""
+        squads = [(split_squads(df[col]), df[team].cat.codes.to_numpy()) for col, team in (('team1_players', 'team1'), ('team2_players', 'team2'))]
+        local = np.concatenate([rows for (rows, _), _ in squads])
+        # hash every name once; only the distinct names are looked up against the interned players
+        encoded = pa.concat_arrays([names for (_, names), _ in squads]).dictionary_encode()
+        distinct = pd.Index(encoded.dictionary.to_pylist(), dtype=object)
+        self.players = self.players.append(distinct[self.players.get_indexer(distinct) < 0])
+        player = self.players.get_indexer(distinct).astype(np.int32)[encoded.indices.to_numpy(zero_copy_only=False)]
+        team = np.concatenate([codes[rows] for (rows, _), codes in squads]).astype(np.int16)
+        new = {
+            'player': player,
+            'row': local + offset,
+            'team': team,
+            'season': df['year'].to_numpy()[local],
+            'won': team == df['winner'].cat.codes.to_numpy()[local],
+            'potm': self.players.get_indexer(df['player_of_match'])[local] == player,
+        }
+        # merge into the (player, row)-sorted arrays so each player's matches stay one ascending slice
+        order = np.lexsort((new['row'], player))
+        at = np.searchsorted(self.player, player[order], side='right')
+        for name, values in new.items(): setattr(self, name, np.insert(getattr(self, name), at, values[order]) if len(self.player) else values[order])
+        counts = np.bincount(player, minlength=len(self.players))
+        self.offsets = np.concatenate([self.offsets, np.full(len(self.players) + 1 - len(self.offsets), self.offsets[-1])]) + np.concatenate([[0], np.cumsum(counts)])
+        self.n_rows += len(df)
+
+    def __len__(self):
+        return len(self.players)
+
+    def matches(self, player_id):
+        return self.row[self.offsets[player_id]:self.offsets[player_id + 1]]
+
+    def stats(self, rows=None):
+        """Appearances, team-win rate while playing and POTM conversion over the given store rows (all if None)."""
+        if rows is None: keep = slice(None)
+        else:
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[rows] = True
+            keep = selected[self.row]
+        player, n = self.player[keep], len(self.players)
+        stats = pd.DataFrame({
+            'Player': self.players,
+            'Appearances': np.bincount(player, minlength=n),
+            'Team Wins': np.bincount(player, weights=self.won[keep], minlength=n).astype(np.int64),
+            'POTM Awards': np.bincount(player, weights=self.potm[keep], minlength=n).astype(np.int64),
+        })
+        stats = stats[stats['Appearances'] > 0].reset_index(drop=True)
+        stats['Team Win Rate (%)'] = stats['Team Wins'] / stats['Appearances'] * 100
+        stats['POTM Conversion (%)'] = stats['POTM Awards'] / stats['Appearances'] * 100
+        return stats
+
+
+class MatchSnapshot:
+    """One consistent version of the matches: the frame with its posting lists, player index and running totals.
+
+    Never mutated after construction. MatchStore.append publishes a successor with a single assignment, so a
+    reader that takes store.snapshot once sees a frame and indexes that belong together, whatever lands meanwhile.
+    """
+
+    def __init__(self, df, year_index, team_index, venue_index, player_index, totals, match_numbers, version=0):
+        self.df, self.year_index, self.team_index, self.venue_index = df, year_index, team_index, venue_index
+        self.player_index, self.totals, self.match_numbers, self.version = player_index, totals, match_numbers, version
+
+    @classmethod
+    def from_frame(cls, df, player_index=None):
+        df = encode_matches(df.reset_index(drop=True))
+        return cls(
+            df, PostingIndex(df['year']), PostingIndex(df['team1'], df['team2']), PostingIndex(df['venue']),
+            PlayerIndex(df) if player_index is None else player_index, count_aggregates(df), np.sort(df['match_number'].to_numpy()),
+        )
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def teams(self):
+        return sorted(self.df['team1'].cat.categories)
+
+    @property
+    def years(self):
+        return sorted(self.year_index.labels, reverse=True)
+
+    @property
+    def venues(self):
+        return sorted(self.venue_index.labels)
+
+    def select_rows(self, years=None, teams=None, venues=None):
+        """Row ids matching every non-empty selection; None means no restriction at all."""
+        # an empty selection means "no filter", and a full one filters nothing either
+        active = [(index, keys) for index, keys in ((self.year_index, years), (self.team_index, teams), (self.venue_index, venues)) if not index.covers(keys)]
+        if not active: return None
+        # expand only the most selective dimension, then check the candidates against the others' codes
+        active.sort(key=lambda pair: pair[0].size(pair[1]))
+        rows = active[0][0].rows(active[0][1])
+        for index, keys in active[1:]: rows = rows[index.contains(rows, keys)]
+        return rows
+
+    def filter(self, years=None, teams=None, venues=None):
+        rows = self.select_rows(years, teams, venues)
+        return self.df if rows is None else self.df.iloc[rows]
+
+    def counts(self, filtered_df):
+        """Running totals for the unfiltered view, otherwise counted from the filtered rows."""
+        return self.totals if filtered_df is self.df else count_aggregates(filtered_df)
+
+    def player_stats(self, filtered_df):
+        # filtered frames keep the snapshot's positional index, so it doubles as their row ids
+        return self.player_index.stats(filtered_df.index.to_numpy())
+
+
+class MatchStore:
+    """The current MatchSnapshot, replaced whole by validated appends and drop-directory ingestion."""
+
+    def __init__(self, df, player_index=None):
+        self.snapshot = MatchSnapshot.from_frame(df, player_index)
+        self.ingested, self.lock = set(), threading.RLock()
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def append(self, raw):
+        """Validate raw Match_Info.csv rows and publish a snapshot with them appended; returns rows added."""
+        with self.lock:
+            snapshot = self.snapshot
+            new = clean_matches(validate_matches(raw, snapshot.match_numbers)).reset_index(drop=True)
+            if new.empty: return 0
+            old, new = extend_categories(snapshot.df, new)
+            # indexes are extended on copies; the published snapshot's are never touched
+            indexes = [copy.copy(index) for index in (snapshot.year_index, snapshot.team_index, snapshot.venue_index, snapshot.player_index)]
+            indexes[0].extend(new['year'])
+            indexes[1].extend(new['team1'], new['team2'])
+            indexes[2].extend(new['venue'])
+            indexes[3].extend(new, len(old))
+            numbers = np.sort(new['match_number'].to_numpy())
+            match_numbers = np.insert(snapshot.match_numbers, np.searchsorted(snapshot.match_numbers, numbers), numbers)
+            totals = merge_counts(snapshot.totals, count_aggregates(new))
+            self.snapshot = MatchSnapshot(pd.concat([old, new], ignore_index=True), *indexes, totals, match_numbers, snapshot.version + 1)
+            return len(new)
+
+    def ingest_directory(self, drop_dir=DROP_DIR):
+        """Append the new rows of every CSV in drop_dir that changed since the last scan; returns {file name: error}.
+
+        Files are re-read whenever their size or mtime moves, and rows whose match_number is already loaded are
+        skipped, so a file that grows only contributes its new rows. A final line without its newline is left for
+        the next scan, so files must end with one. Dotfiles are ignored: copying into a hidden name and renaming
+        into place publishes a file in one step, which is the safe way to drop files that are not appended to.
+        """
+        if not os.path.isdir(drop_dir): return {}
+        errors = {}
+        with self.lock:
+            for entry in sorted(os.scandir(drop_dir), key=lambda e: e.name):
+                if not entry.is_file() or entry.name.startswith('.') or not entry.name.endswith('.csv'): continue
+                stat = entry.stat()
+                key = (entry.name, stat.st_mtime_ns, stat.st_size)
+                if key in self.ingested: continue
+                self.ingested.add(key)
+                with open(entry.path, 'rb') as f: data = f.read()
+                # everything after the last newline may still be mid-write
+                data = data[:data.rfind(b'\n') + 1]
+                if not data: continue
+                try:
+                    raw = pd.read_csv(io.BytesIO(data))
+                    if 'match_number' in raw: raw = raw[~pd.to_numeric(raw['match_number'], errors='coerce').isin(self.snapshot.match_numbers)]
+                    self.append(raw)
+                except ValueError as e: errors[entry.name] = str(e)
+        return errors
+
+
+def category_flags(col, predicate):
+    """Evaluate predicate once per category and broadcast it to rows by code; missing values are False."""
+    flags = np.append(np.asarray(predicate(col.cat.categories.astype(str)), dtype=bool), False)
+    return flags[col.cat.codes.to_numpy()]
+
+
+def batting_first_won(df):
+    """True where the winner batted first: the toss winner chose to bat, or the toss loser was sent in."""
+    winner = df['winner'].cat.codes.to_numpy()
+    toss_won = (df['toss_winner'].cat.codes.to_numpy() == winner) & (winner >= 0)
+    return toss_won == category_flags(df['toss_decision'], lambda c: c.str.lower() == 'bat')
+
+
+def toss_strategy(df):
+    """Bat-first vs field-first wins overall and per team, venue and season, rolled up from one grouped count."""
+    strategy = pd.Categorical.from_codes(np.where(batting_first_won(df), 0, 1), categories=STRATEGIES)
+    keys = pd.DataFrame({'Team': df['winner'], 'Venue': df['venue'], 'Season': df['year'], 'Strategy': strategy})
+    cube = keys.groupby(['Team', 'Venue', 'Season', 'Strategy'], observed=True, dropna=False).size()
+    breakdown = lambda level: cube.groupby(level=[level, 'Strategy'], observed=True).sum().unstack(fill_value=0).reindex(columns=STRATEGIES, fill_value=0)
+    return {
+        'overall': cube.groupby(level='Strategy', observed=False).sum().reindex(STRATEGIES, fill_value=0),
+        'team': breakdown('Team'),
+        'venue': breakdown('Venue'),
+        'season': breakdown('Season'),
+    }
+
+
+def team_stats(df):
+    """Matches played, wins and win rate for every team that appears in df, from one long appearances table."""
+    t1, t2, w = (df[col].cat.codes.to_numpy() for col in ('team1', 'team2', 'winner'))
+    appearances = pd.DataFrame({
+        'Team': pd.Categorical.from_codes(np.concatenate([t1, t2]), categories=df['team1'].cat.categories),
+        'won': np.concatenate([t1 == w, t2 == w]),
+    })
+    stats = appearances.groupby('Team', observed=True)['won'].agg(['size', 'sum'])
+    stats.columns = ['Matches Played', 'Wins']
+    stats['Win Rate (%)'] = stats['Wins'] / stats['Matches Played'] * 100
+    return stats.reset_index()
+
+
+def recent_matches(df, n=10):
+    """The n latest matches for the Recent Match Log; only those rows get their dates formatted."""
+    recent = df.loc[df['match_date'].nlargest(n).index, ['match_date', 'team1', 'team2', 'winner', 'player_of_match']]
+    recent = recent.assign(match_date=recent['match_date'].dt.strftime('%Y-%m-%d'))
+    recent.columns = ['Date', 'Team 1', 'Team 2', 'Winner', 'Player of Match']
+    return recent
+
+
+def head_to_head(df):
+    """Team x team encounter and win counts (row team beat column team) from one bincount over coded pairs."""
+    teams = df['team1'].cat.categories
+    n = len(teams)
+    t1, t2, w = (df[col].cat.codes.to_numpy().astype(np.int64) for col in ('team1', 'team2', 'winner'))
+    valid = (t1 >= 0) & (t2 >= 0)
+    encounters = np.bincount(t1[valid] * n + t2[valid], minlength=n * n).reshape(n, n)
+    decided = valid & ((w == t1) | (w == t2))
+    loser = np.where(w == t1, t2, t1)[decided]
+    wins = np.bincount(w[decided] * n + loser, minlength=n * n).reshape(n, n)
+    labels = sorted(teams)  # appended teams extend the categories out of order
+    return {
+        'encounters': pd.DataFrame(encounters + encounters.T, index=teams, columns=teams).loc[labels, labels],
+        'wins': pd.DataFrame(wins, index=teams, columns=teams).loc[labels, labels],
+    }
+
+
+def export_schema(df):
+    """Arrow schema for writing df in slices; object columns are typed as strings, which an empty slice cannot infer."""
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    for i, col in enumerate(df.columns):
+        if df[col].dtype == object: schema = schema.set(i, pa.field(col, pa.string()))
+    return schema
+
+
+def export_matches(df, fmt='csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Serialize df to CSV or Parquet bytes, converting chunk_rows rows at a time; only the encoded file is held whole."""
+    buffer = io.BytesIO()
+    if fmt == 'parquet':
+        schema = export_schema(df)
+        with pq.ParquetWriter(buffer, schema) as writer:
+            for start in range(0, len(df), chunk_rows): writer.write_table(pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False))
+    else:
+        df.iloc[:0].to_csv(buffer, index=False)
+        for start in range(0, len(df), chunk_rows): df.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=False)
+    return buffer.getvalue()
+
+
+def mask_filter(df, years=None, teams=None, venues=None):
+    """The original per-rerun boolean-mask filter, kept as the benchmark baseline."""
+    return df[(df['year'].isin(years) if years else True) & ((df['team1'].isin(teams)) | (df['team2'].isin(teams)) if teams else True) & (df['venue'].isin(venues) if venues else True)].copy()
@@ -0,0 +1,209 @@
+"""Headless benchmarks for the dashboard's data layer, outside Streamlit.
+
+    python bench.py micro                     # old vs new implementations at 1k/100k/1M rows
+    python bench.py tabs --factors 10 100 1000 --json bench.json --baseline previous.json
+    python bench.py check                     # Parquet round-trip, and batched appends equal a full build
+"""
+import argparse
+import io
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import MatchStore, clean_matches, export_matches, head_to_head, mask_filter, recent_matches, team_stats, toss_strategy
+
+CALIBRATION = 'calibration'
+
+
+def synthesize(base, n_rows, seed=0):
+    """Resample cleaned matches up to n_rows, with unique match numbers."""
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+    df['match_number'] = np.arange(n_rows)
+    return df
+
+
+def timeit(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def iterrows_toss_strategy(df):
+    """The original per-row Bat/Field Win Strategy loop, kept as the benchmark baseline."""
+    wins_by_decision = {'Bat First': 0, 'Field First': 0}
+    for _, row in df.iterrows():
+        if row['toss_winner'] == row['winner']: wins_by_decision['Bat First' if str(row['toss_decision']).lower() == 'bat' else 'Field First'] += 1
+        else: wins_by_decision['Field First' if str(row['toss_decision']).lower() == 'bat' else 'Bat First'] += 1
+    return wins_by_decision
+
+
+def bench_filter(base, sizes):
+    print(f"{'rows':>10} {'mask ms':>10} {'store ms':>10} {'speedup':>8}")
+    for n in sizes:
+        df = synthesize(base, n)
+        snapshot = MatchStore(df).snapshot
+        years, teams, venues = snapshot.years[:5], snapshot.teams[:6], snapshot.venues[:20]
+        mask_ms = timeit(lambda: mask_filter(df, years, teams, venues))
+        store_ms = timeit(lambda: snapshot.filter(years, teams, venues))
+        print(f"{n:>10,} {mask_ms:>10.2f} {store_ms:>10.2f} {mask_ms / store_ms:>7.1f}x")
+
+
+def bench_toss(base, sizes):
+    print(f"{'rows':>10} {'iterrows ms':>12} {'engine ms':>10} {'speedup':>8}")
+    for n in sizes:
+        df = MatchStore(synthesize(base, n)).snapshot.df
+        loop_ms = timeit(lambda: iterrows_toss_strategy(df), repeat=1)
+        engine_ms = timeit(lambda: toss_strategy(df))
+        print(f"{n:>10,} {loop_ms:>12.2f} {engine_ms:>10.2f} {loop_ms / engine_ms:>7.1f}x")
+
+
+def bench_append(base, sizes, batch=100):
+    raw = pd.read_csv('Match_Info.csv')
+    print(f"{'rows':>10} {'rebuild ms':>11} {'append ms':>10} {'speedup':>8}")
+    for n in sizes:
+        df = synthesize(base, n)
+        store = MatchStore(df)
+        new = raw.sample(batch, random_state=0).assign(match_number=np.arange(n, n + batch))
+        rebuild_ms = timeit(lambda: MatchStore(pd.concat([df, clean_matches(new)], ignore_index=True)), repeat=1)
+        append_ms = timeit(lambda: store.append(new), repeat=1)
+        print(f"{n:>10,} {rebuild_ms:>11.2f} {append_ms:>10.2f} {rebuild_ms / append_ms:>7.1f}x")
+
+
+def check_exports(snapshot, chunk_rows=100):
+    """Round-trip the snapshot's frame, whole and filtered, through a multi-chunk Parquet export; raises AssertionError."""
+    for df in (snapshot.df, snapshot.filter(snapshot.years[:5], snapshot.teams[:4])):
+        back = pd.read_parquet(io.BytesIO(export_matches(df, 'parquet', chunk_rows)))
+        # Arrow hands missing strings back as None where the frame held NaN
+        pd.testing.assert_frame_equal(back.mask(back.isna()), df.reset_index(drop=True), check_dtype=False)
+
+
+def check_append(raw, batches=3):
+    """Append held-back matches in batches and compare against one MatchStore over the same rows; raises AssertionError."""
+    # holding back a team and a venue makes the batches introduce unseen categories
+    held = raw['team1'].eq('Gujarat Titans') | raw['team2'].eq('Gujarat Titans') | raw['venue'].str.contains('Wankhede')
+    chunks = [raw[held].iloc[i::batches] for i in range(batches)]
+    store = MatchStore(clean_matches(raw[~held]))
+    for chunk in chunks: store.append(chunk)
+    appended, full = store.snapshot, MatchStore(clean_matches(pd.concat([raw[~held]] + chunks, ignore_index=True))).snapshot
+    for name in full.totals: pd.testing.assert_series_equal(appended.totals[name].sort_index(), full.totals[name].sort_index())
+    selections = [(None, None, None), (full.years[:3], full.teams[:4], None), (None, ['Gujarat Titans'], None), (full.years[:5], None, [v for v in full.venues if 'Wankhede' in v])]
+    for selection in selections:
+        got, want = appended.filter(*selection), full.filter(*selection)
+        assert list(got['match_number']) == list(want['match_number']), f"filter rows differ for {selection}"
+        players = [snapshot.player_stats(df).sort_values('Player', ignore_index=True) for snapshot, df in ((appended, got), (full, want))]
+        pd.testing.assert_frame_equal(*players)
+        for name, frame in head_to_head(got).items(): pd.testing.assert_frame_equal(frame, head_to_head(want)[name])
+
+
+def calibration_workload(n=100_000, seed=0):
+    """A fixed sort/group/format job independent of the code under test, timed alongside it to gauge machine speed."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'key': rng.integers(0, 1_000, n), 'value': rng.random(n)})
+    return lambda: (np.sort(frame['value'].to_numpy()), frame.groupby('key')['value'].sum(), frame.iloc[:n // 10].to_csv())
+
+
+def run_tabs(snapshot, repeat=5, page_size=50):
+    """Every tab's computation for the dashboard's default selection, as best-of-repeat milliseconds per section."""
+    years = snapshot.years[:5]
+    df = snapshot.filter(years, snapshot.teams, snapshot.venues)
+    columns = [c for c in df.columns if c not in ('team1_players', 'team2_players')]
+    sections = {
+        'filter': lambda: snapshot.filter(years, snapshot.teams, snapshot.venues),
+        'team_stats': lambda: team_stats(df),
+        'counts': lambda: snapshot.counts(df),
+        'toss_strategy': lambda: toss_strategy(df),
+        'recent_matches': lambda: recent_matches(df),
+        'head_to_head': lambda: head_to_head(df),
+        'raw_window': lambda: df.iloc[:page_size][columns],
+        'export_csv': lambda: export_matches(df[columns], 'csv'),
+        'export_parquet': lambda: export_matches(df[columns], 'parquet'),
+        'player_stats': lambda: snapshot.player_stats(df),
+        CALIBRATION: calibration_workload(),
+    }
+    # round-robin rather than back to back, so a slow stretch costs each section one sample rather than all of them
+    best = dict.fromkeys(sections, float('inf'))
+    for _ in range(repeat):
+        for name, fn in sections.items(): best[name] = min(best[name], timeit(fn, repeat=1))
+    return {name: round(ms, 3) for name, ms in best.items()}
+
+
+def bench_tabs(base, factors, repeat=5):
+    """Per-section milliseconds for each synthetic scale factor, keyed like {'10x': {'filter': 1.2, ...}}."""
+    results = {}
+    for factor in factors:
+        df = synthesize(base, len(base) * factor)
+        # seconds long at the larger scales, so a single build is timed
+        start = time.perf_counter()
+        store = MatchStore(df)
+        results[f'{factor}x'] = {'build_store': round((time.perf_counter() - start) * 1000, 3), **run_tabs(store.snapshot, repeat)}
+        print(f"{factor}x ({len(df):,} rows)")
+        for name, ms in results[f'{factor}x'].items(): print(f"  {name:<16} {ms:>10.2f} ms")
+    return results
+
+
+def regressions(results, baseline, tolerance, min_ms):
+    """(scale, section, baseline ms, ms) for sections slower by more than tolerance (a fraction) and at least min_ms.
+
+    When the calibration workload ran slower than in the baseline, the machine is busier or throttled, and every
+    baseline figure is scaled up by that factor first; a faster machine never tightens the check.
+    """
+    slower = []
+    for scale, sections in results.items():
+        before = baseline.get(scale, {})
+        speed = max(1.0, sections[CALIBRATION] / before[CALIBRATION]) if CALIBRATION in sections and CALIBRATION in before else 1.0
+        for name, ms in sections.items():
+            if name == CALIBRATION or name not in before: continue
+            expected = before[name] * speed
+            if ms > expected * (1 + tolerance) and ms - expected >= min_ms: slower.append((scale, name, before[name], ms))
+    return slower
+
+
+def recheck(base, results, slower, repeat):
+    """Time the scales with apparent regressions again, keeping each section's faster reading of the two passes."""
+    retry = bench_tabs(base, sorted({int(scale[:-1]) for scale, *_ in slower}), repeat)
+    return {scale: {name: min(ms, retry.get(scale, {}).get(name, ms)) for name, ms in sections.items()} for scale, sections in results.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('suite', nargs='?', choices=['micro', 'tabs', 'check'], default='micro')
+    parser.add_argument('--factors', nargs='+', type=int, default=[10, 100, 1000], help="multiples of Match_Info.csv's size")
+    parser.add_argument('--json', help="write the tabs results to this file")
+    parser.add_argument('--baseline', help="a previous --json file to compare against; exits 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown versus the baseline (default 0.25)")
+    parser.add_argument('--min-ms', type=float, default=5.0, help="ignore slowdowns smaller than this many milliseconds (default 5)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per section; the fastest is reported (default 5)")
+    args = parser.parse_args()
+
+    base = clean_matches(pd.read_csv('Match_Info.csv'))
+    if args.suite == 'micro':
+        sizes = [1_000, 100_000, 1_000_000]
+        bench_filter(base, sizes)
+        bench_toss(base, sizes)
+        bench_append(base, sizes)
+    elif args.suite == 'check':
+        check_exports(MatchStore(base).snapshot)
+        check_append(pd.read_csv('Match_Info.csv'))
+        print("parquet export round-trips; batched appends match a full build")
+    else:
+        results = bench_tabs(base, args.factors, args.repeat)
+        slower = []
+        if args.baseline:
+            with open(args.baseline) as f: baseline = json.load(f)
+            slower = regressions(results, baseline, args.tolerance, args.min_ms)
+            if slower:
+                # a one-off stall should not fail the run: only what is still slow on a longer second pass counts
+                print("rechecking " + ", ".join(f"{scale} {name}" for scale, name, *_ in slower))
+                results = recheck(base, results, slower, args.repeat * 2)
+                slower = regressions(results, baseline, args.tolerance, args.min_ms)
+            for scale, name, before, after in slower: print(f"REGRESSION {scale} {name}: {before:.2f} -> {after:.2f} ms")
+        if args.json:
+            with open(args.json, 'w') as f: json.dump(results, f, indent=2)
+        sys.exit(1 if slower else 0)
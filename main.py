@@ -2,10 +2,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import base64
+import io
 import os
+from PIL import Image
+from analytics import export_matches, head_to_head, load_store, recent_matches, team_stats, toss_strategy
+from profiling import Profiler, mark_cache_miss
 
 st.set_page_config(page_title="IPL Analytics Hub", page_icon="🏏", layout="wide", initial_sidebar_state="collapsed")
 
+# opt-in per-rerun timings: IPL_PROFILE=1 in the environment or ?profile=1 in the URL
+profiler = Profiler(os.environ.get("IPL_PROFILE") == "1" or st.query_params.get("profile") == "1")
+
 # --- COMPRESSED CSS STYLING ---
 st.markdown("""
     <style>
@@ -42,15 +49,22 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-def get_image_base64(path_or_url):
-    if not path_or_url: return ""
-    if path_or_url.startswith("http"): return path_or_url
-    if os.path.isfile(path_or_url):
-        with open(path_or_url, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode()
-            ext = path_or_url.split(".")[-1].lower()
-            return f"data:image/{'jpeg' if ext in ['jpg', 'jpeg'] else ext};base64,{encoded}"
-    return "data:image/gif;base64,R0lGODlhAQABAIAAAP///wAAACH5BAEAAAAALAAAAAABAAEAAAICRAEAOw=="
+BLANK_IMAGE = "data:image/gif;base64,R0lGODlhAQABAIAAAP///wAAACH5BAEAAAAALAAAAAABAAEAAAICRAEAOw=="
+LOGO_DIR = os.path.join("static", "logos")
+LOGO_SIZE = 260  # twice the widest on-page logo (the 130px Head-to-Head panels) for high-DPI screens
+
+def downsize_logo(path):
+    image = Image.open(path)
+    image.thumbnail((LOGO_SIZE, LOGO_SIZE))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    name = os.path.basename(path)
+    try:
+        os.makedirs(LOGO_DIR, exist_ok=True)
+        with open(os.path.join(LOGO_DIR, name), "wb") as f: f.write(buffer.getvalue())
+        return f"app/static/logos/{name}"  # served by enableStaticServing in .streamlit/config.toml
+    except OSError:
+        return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
 
 TEAM_LOGOS = {
     "Chennai Super Kings": "https://upload.wikimedia.org/wikipedia/en/thumb/2/2b/Chennai_Super_Kings_Logo.svg/200px-Chennai_Super_Kings_Logo.svg.png",
@@ -68,15 +82,33 @@ TEAM_LOGOS = {
     "Lucknow Super Giants": "https://upload.wikimedia.org/wikipedia/en/thumb/a/a9/Lucknow_Super_Giants_IPL_Logo.svg/200px-Lucknow_Super_Giants_IPL_Logo.svg.png"
 }
 
-@st.cache_data
+# resolved once per process: remote logos pass through, local files are downsized and served as static assets
+@st.cache_resource
+def load_logo_urls():
+    mark_cache_miss()
+    return {src: src if src.startswith("http") else downsize_logo(src) if os.path.isfile(src) else BLANK_IMAGE for src in set(TEAM_LOGOS.values())}
+
+def logo_url(team):
+    return load_logo_urls().get(TEAM_LOGOS.get(team, ""), "")
+
+# cache_resource shares one store across reruns and sessions; cache_data would unpickle a fresh copy every rerun
+@st.cache_resource
 def load_data():
-    df = pd.read_csv("Match_Info.csv")
-    df['match_date'] = pd.to_datetime(df['match_date'], errors='coerce')
-    df['year'] = df['match_date'].dt.year
-    df['team1'], df['team2'], df['winner'] = df['team1'].str.strip(), df['team2'].str.strip(), df['winner'].str.strip()
-    return df[df['result'] == 'Win'].copy()
+    mark_cache_miss()
+    return load_store("Match_Info.csv")
+
+with profiler.cached("load_data"): store = load_data()
+# CSVs dropped into incoming/ publish a new snapshot on the shared store; the version keys the caches below
+with profiler.section("ingest_directory"): ingest_errors = store.ingest_directory()
+for name, error in ingest_errors.items(): st.warning(f"Skipped {name}: {error}")
+# read once: appends from other sessions replace store.snapshot, never the one this rerun holds
+snapshot = store.snapshot
 
-df = load_data()
+# keyed on the filter selection, so switching the compared teams is a lookup rather than a rescan
+@st.cache_data
+def load_head_to_head(_snapshot, version, selected_years, selected_teams, selected_venues):
+    mark_cache_miss()
+    return head_to_head(_snapshot.filter(selected_years, selected_teams, selected_venues))
 
 st.markdown('''
     <div class="glow-header-container">
@@ -105,84 +137,74 @@ st.markdown('''
 ''', unsafe_allow_html=True)
 
 active_teams = ["Chennai Super Kings", "Mumbai Indians", "Royal Challengers Bangalore", "Kolkata Knight Riders", "Sunrisers Hyderabad", "Rajasthan Royals", "Delhi Capitals", "Punjab Kings", "Gujarat Titans", "Lucknow Super Giants"]
-banner_html = '<div class="logo-banner">' + "".join([f'<div class="logo-card"><img src="{get_image_base64(TEAM_LOGOS.get(t, ""))}" title="{t}" alt="{t}"></div>' for t in active_teams if TEAM_LOGOS.get(t, "")]) + "</div>"
+with profiler.cached("load_logo_urls"): load_logo_urls()
+banner_html = '<div class="logo-banner">' + "".join([f'<div class="logo-card"><img src="{logo_url(t)}" title="{t}" alt="{t}"></div>' for t in active_teams if TEAM_LOGOS.get(t, "")]) + "</div>"
 st.markdown(banner_html, unsafe_allow_html=True)
 
 with st.expander("⚙️ Dashboard Filters", expanded=True):
     col_f1, col_f2, col_f3 = st.columns([1, 1, 1])
-    years = sorted(df['year'].dropna().unique(), reverse=True)
-    all_teams = sorted(set(df['team1'].unique().tolist() + df['team2'].unique().tolist()))
-    all_venues = sorted(df['venue'].dropna().unique())
+    years, all_teams, all_venues = snapshot.years, snapshot.teams, snapshot.venues
 
     with col_f1: selected_years = st.multiselect("Select Year(s)", options=years, default=years[:5] if len(years) >= 5 else years)
     with col_f2: selected_teams = st.multiselect("Select Team(s)", options=all_teams, default=all_teams)
     with col_f3: selected_venues = st.multiselect("Select Venue(s)", options=all_venues, default=all_venues)
 
-filtered_df = df[(df['year'].isin(selected_years) if selected_years else True) & ((df['team1'].isin(selected_teams)) | (df['team2'].isin(selected_teams)) if selected_teams else True) & (df['venue'].isin(selected_venues) if selected_venues else True)].copy()
+with profiler.section("filter"): filtered_df = snapshot.filter(selected_years, selected_teams, selected_venues)
+with profiler.section("team_stats"): team_table = team_stats(filtered_df)
+with profiler.section("counts"): counts = snapshot.counts(filtered_df)
 
 st.markdown("<br>", unsafe_allow_html=True)
 kpi1, kpi2, kpi3, kpi4 = st.columns([1, 1, 1, 1])
 
 with kpi1: st.markdown(f'<div class="kpi-wrapper"><div class="kpi-icon">🏏</div><div class="kpi-title">Matches</div><div class="kpi-value">{len(filtered_df):,}</div></div>', unsafe_allow_html=True)
-with kpi2: st.markdown(f'<div class="kpi-wrapper"><div class="kpi-icon">🛡️</div><div class="kpi-title">Teams</div><div class="kpi-value">{len(set(filtered_df["team1"].unique().tolist() + filtered_df["team2"].unique().tolist()))}</div></div>', unsafe_allow_html=True)
+with kpi2: st.markdown(f'<div class="kpi-wrapper"><div class="kpi-icon">🛡️</div><div class="kpi-title">Teams</div><div class="kpi-value">{len(team_table)}</div></div>', unsafe_allow_html=True)
 with kpi3: st.markdown(f'<div class="kpi-wrapper"><div class="kpi-icon">🏟️</div><div class="kpi-title">Venues</div><div class="kpi-value">{filtered_df["venue"].nunique()}</div></div>', unsafe_allow_html=True)
 with kpi4: st.markdown(f'<div class="kpi-wrapper"><div class="kpi-icon">🏙️</div><div class="kpi-title">Cities</div><div class="kpi-value">{filtered_df["city"].nunique()}</div></div>', unsafe_allow_html=True)
 
 st.markdown("<br>", unsafe_allow_html=True)
-tab1, tab2, tab3, tab4 = st.tabs(["📊 Performance Analysis", "⚔️ Head-to-Head", "📋 Raw Dataset", "🔬 Advanced Insights"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Performance Analysis", "⚔️ Head-to-Head", "📋 Raw Dataset", "🔬 Advanced Insights", "👤 Players"])
 
-with tab1:
+with tab1, profiler.section("tab: Performance Analysis"):
     row1_col1, row1_col2 = st.columns([1, 1])
-    with row1_col1:
+    with row1_col1, profiler.section("Team Win Count"):
         st.markdown("### Team Win Count")
-        team_wins = filtered_df['winner'].value_counts().head(10).reset_index()
-        team_wins.columns = ['Team', 'Wins']
+        team_wins = team_table[team_table['Wins'] > 0].sort_values('Wins', ascending=False, kind='stable').head(10)
         fig_wins = px.bar(team_wins, x='Team', y='Wins', color='Wins', color_continuous_scale='Blues')
         fig_wins.update_layout(plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
         st.plotly_chart(fig_wins, use_container_width=True)
-    with row1_col2:
+    with row1_col2, profiler.section("Toss Decision Trends"):
         st.markdown("### Toss Decision Trends")
-        toss_decision = filtered_df['toss_decision'].value_counts().reset_index()
-        toss_decision.columns = ['Decision', 'Count']
+        toss_decision = counts['toss_decisions'].rename_axis('Decision').reset_index(name='Count')
         # MODIFIED COLORS HERE: High contrast Blue vs Teal
         fig_toss = px.pie(toss_decision, names='Decision', values='Count', hole=0.5, color_discrete_sequence=['#3b82f6', '#2dd4bf'])
         fig_toss.update_layout(plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), legend=dict(orientation="h", y=-0.2), margin=dict(l=10, r=10, t=30, b=10))
         st.plotly_chart(fig_toss, use_container_width=True)
 
     row2_col1, row2_col2 = st.columns([1, 1])
-    with row2_col1:
+    with row2_col1, profiler.section("Bat/Field Win Strategy"):
         st.markdown("### Bat/Field Win Strategy")
-        wins_by_decision = {'Bat First': 0, 'Field First': 0}
-        for _, row in filtered_df.iterrows():
-            if row['toss_winner'] == row['winner']: wins_by_decision['Bat First' if str(row['toss_decision']).lower() == 'bat' else 'Field First'] += 1
-            else: wins_by_decision['Field First' if str(row['toss_decision']).lower() == 'bat' else 'Bat First'] += 1
-        decision_df = pd.DataFrame({'Strategy': list(wins_by_decision.keys()), 'Matches Won': list(wins_by_decision.values())})
+        decision_df = toss_strategy(filtered_df)['overall'].rename_axis('Strategy').reset_index(name='Matches Won')
         fig_toss_win = px.bar(decision_df, x='Strategy', y='Matches Won', color='Strategy', color_discrete_sequence=['#1e40af', '#3b82f6'])
         fig_toss_win.update_layout(plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), showlegend=False, margin=dict(l=10, r=10, t=30, b=10))
         st.plotly_chart(fig_toss_win, use_container_width=True)
-    with row2_col2:
+    with row2_col2, profiler.section("Recent Match Log"):
         st.markdown("### Recent Match Log")
-        display_df = filtered_df[['match_date', 'team1', 'team2', 'winner', 'player_of_match']].copy()
-        display_df['match_date'] = display_df['match_date'].dt.strftime('%Y-%m-%d')
-        display_df = display_df.sort_values('match_date', ascending=False).head(10)
-        display_df.columns = ['Date', 'Team 1', 'Team 2', 'Winner', 'Player of Match']
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
+        st.dataframe(recent_matches(filtered_df), use_container_width=True, hide_index=True)
         
     st.markdown('''<div class="insight-card"><div class="insight-icon">💡</div><div class="insight-content"><span class="insight-title">Strategic Performance Insight</span>The bar chart demonstrates a clear hierarchy in franchise performance, with select teams accumulating significantly more historical wins. The toss analysis reveals a distinct trend where captains prefer to field first, and the subsequent win strategy chart proves this decision is structurally advantageous, yielding higher match win rates when chasing targets.</div></div>''', unsafe_allow_html=True)
 
-with tab2:
+with tab2, profiler.section("tab: Head-to-Head"):
     st.markdown("### Compare Teams")
     h2h_col1, h2h_col2 = st.columns([1, 1])
     team1_select = h2h_col1.selectbox("Select Team 1", options=all_teams, index=all_teams.index('Chennai Super Kings') if 'Chennai Super Kings' in all_teams else 0)
     team2_select = h2h_col2.selectbox("Select Team 2", options=all_teams, index=all_teams.index('Mumbai Indians') if 'Mumbai Indians' in all_teams else 1)
 
+    with profiler.cached("load_head_to_head"): h2h = load_head_to_head(snapshot, snapshot.version, tuple(selected_years), tuple(selected_teams), tuple(selected_venues))
+
     if team1_select and team2_select and team1_select != team2_select:
-        h2h_matches = filtered_df[((filtered_df['team1'] == team1_select) & (filtered_df['team2'] == team2_select)) | ((filtered_df['team1'] == team2_select) & (filtered_df['team2'] == team1_select))]
-        team1_wins = len(h2h_matches[h2h_matches['winner'] == team1_select])
-        team2_wins = len(h2h_matches[h2h_matches['winner'] == team2_select])
-        total_matches = len(h2h_matches)
-        logo1 = get_image_base64(TEAM_LOGOS.get(team1_select, ""))
-        logo2 = get_image_base64(TEAM_LOGOS.get(team2_select, ""))
+        team1_wins, team2_wins = h2h['wins'].at[team1_select, team2_select], h2h['wins'].at[team2_select, team1_select]
+        total_matches = h2h['encounters'].at[team1_select, team2_select]
+        logo1, logo2 = logo_url(team1_select), logo_url(team2_select)
 
         logo_col1, logo_col2, logo_col3 = st.columns([1, 1, 1])
         with logo_col1:
@@ -193,44 +215,94 @@ with tab2:
         with logo_col3:
             st.markdown(f"<div style='text-align: center; padding: 10px;'><img src='{logo2}' style='width: 100%; max-width: 130px; object-fit: contain;'></div><h2 style='text-align: center; color: #1e40af; margin: 0; font-family: Outfit; font-size: clamp(1.5rem, 4vw, 2.5rem);'>{team2_wins} Wins</h2>", unsafe_allow_html=True)
 
+    st.markdown("### Pairwise Win Matrix")
+    played = h2h['encounters'].index[h2h['encounters'].sum(axis=1) > 0]
+    win_pct = (h2h['wins'] / h2h['encounters'].where(h2h['encounters'] > 0) * 100).loc[played, played].round(1)
+    fig_h2h = px.imshow(win_pct, text_auto=True, aspect='auto', color_continuous_scale='Blues', labels=dict(x='Opponent', y='Team', color='Win Rate (%)'))
+    fig_h2h.update_layout(plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
+    st.plotly_chart(fig_h2h, use_container_width=True)
+
     st.markdown('''<div class="insight-card"><div class="insight-icon">🔍</div><div class="insight-content"><span class="insight-title">Head-to-Head Insight</span>This comparison isolates historical matchups between specific franchises. Reviewing direct win-loss ratios exposes psychological advantages and matchup dependencies that are obscured in aggregate seasonal standings. Outliers in these direct records often dictate specific player auction strategies.</div></div>''', unsafe_allow_html=True)
 
-with tab3:
+with tab3, profiler.section("tab: Raw Dataset"):
     st.markdown("### Full Match Database")
-    st.dataframe(filtered_df, use_container_width=True)
-    st.download_button(label="📥 Download as CSV", data=filtered_df.to_csv(index=False), file_name="ipl_analysis_data.csv", mime="text/csv")
+    raw_col1, raw_col2, raw_col3 = st.columns([3, 1, 1])
+    default_columns = [c for c in filtered_df.columns if c not in ('team1_players', 'team2_players')]
+    shown_columns = raw_col1.multiselect("Columns", options=list(filtered_df.columns), default=default_columns) or default_columns
+    page_size = raw_col2.selectbox("Rows per Page", options=[25, 50, 100, 250], index=1)
+    n_pages = max(-(-len(filtered_df) // page_size), 1)
+    page = raw_col3.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+    # only the visible window is serialized to the browser
+    with profiler.section("Raw Dataset window"): st.dataframe(filtered_df.iloc[(page - 1) * page_size:page * page_size][shown_columns], use_container_width=True)
+
+    exp_col1, exp_col2 = st.columns([1, 1])
+    export_format = exp_col1.radio("Export Format", options=["CSV", "Parquet"], horizontal=True)
+    export_key = (snapshot.version, tuple(selected_years), tuple(selected_teams), tuple(selected_venues), tuple(shown_columns), export_format)
+    # the file is only generated on request, and dropped once it is downloaded or the selection it was built from changes
+    if exp_col2.button("⚙️ Prepare Export"):
+        with profiler.section("export"): st.session_state['export'] = (export_key, export_matches(filtered_df[shown_columns], export_format.lower()))
+    if st.session_state.get('export', (None,))[0] == export_key:
+        st.download_button(label=f"📥 Download as {export_format}", data=st.session_state['export'][1], file_name=f"ipl_analysis_data.{export_format.lower()}", mime="text/csv" if export_format == "CSV" else "application/octet-stream", on_click=lambda: st.session_state.pop('export', None))
+    else: st.session_state.pop('export', None)
     st.markdown('''<div class="insight-card"><div class="insight-icon">📊</div><div class="insight-content"><span class="insight-title">Data Transparency</span>Providing the raw dataset ensures analytical transparency and allows users to trace the visual insights back to specific event occurrences. The table format is necessary for identifying edge cases, examining anomalies in specific venues, and auditing match outcomes at a highly granular level.</div></div>''', unsafe_allow_html=True)
 
-with tab4:
+with tab4, profiler.section("tab: Advanced Insights"):
     adv_col1, adv_col2 = st.columns([1, 1])
-    with adv_col1:
+    with adv_col1, profiler.section("Match Frequency / Active Venues"):
         st.markdown("### Match Frequency Over Time")
-        matches_by_year = filtered_df.groupby('year').size().reset_index(name='matches')
+        matches_by_year = counts['years'].sort_index().rename_axis('year').reset_index(name='matches')
         fig_timeline = px.line(matches_by_year, x='year', y='matches', markers=True, color_discrete_sequence=['#2563eb'])
         fig_timeline.update_layout(plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
         st.plotly_chart(fig_timeline, use_container_width=True)
 
         st.markdown("### Most Active Venues")
-        top_venues = filtered_df['venue'].value_counts().head(8).reset_index()
-        top_venues.columns = ['Venue', 'Matches']
+        top_venues = counts['venues'].head(8).rename_axis('Venue').reset_index(name='Matches')
         fig_venues = px.bar(top_venues, x='Matches', y='Venue', orientation='h', color='Matches', color_continuous_scale='Blues')
         fig_venues.update_layout(yaxis={'categoryorder':'total ascending'}, plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
         st.plotly_chart(fig_venues, use_container_width=True)
 
-    with adv_col2:
+    with adv_col2, profiler.section("Star Performers / Win Efficiency"):
         st.markdown("### Top Star Performers (POTM)")
-        top_players = filtered_df['player_of_match'].value_counts().head(8).reset_index()
-        top_players.columns = ['Player', 'Awards']
+        top_players = counts['potm'].head(8).rename_axis('Player').reset_index(name='Awards')
         fig_players = px.bar(top_players, x='Awards', y='Player', orientation='h', color='Awards', color_continuous_scale='Purples')
         fig_players.update_layout(yaxis={'categoryorder':'total ascending'}, plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
         st.plotly_chart(fig_players, use_container_width=True)
 
         st.markdown("### Win Efficiency Distribution")
-        team_stats = [{'Team': t, 'Matches Played': len(filtered_df[(filtered_df['team1'] == t) | (filtered_df['team2'] == t)]), 'Wins': len(filtered_df[filtered_df['winner'] == t]), 'Win Rate (%)': (len(filtered_df[filtered_df['winner'] == t]) / len(filtered_df[(filtered_df['team1'] == t) | (filtered_df['team2'] == t)])) * 100} for t in all_teams if len(filtered_df[(filtered_df['team1'] == t) | (filtered_df['team2'] == t)]) > 0]
-        fig_scatter = px.scatter(pd.DataFrame(team_stats), x='Matches Played', y='Wins', size='Win Rate (%)', color='Team', hover_name='Team')
+        fig_scatter = px.scatter(team_table, x='Matches Played', y='Wins', size='Win Rate (%)', color='Team', hover_name='Team')
         fig_scatter.update_layout(plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10), showlegend=False)
         st.plotly_chart(fig_scatter, use_container_width=True)
 
     st.markdown('''<div class="insight-card"><div class="insight-icon">🚀</div><div class="insight-content"><span class="insight-title">Advanced Metric Observations</span>The line chart documents scheduling shifts and timeline disruptions, while the venue layout reveals spatial dependencies for specific teams. The scatter plot provides crucial insight into win efficiency, plotting total matches against actual wins. Teams positioned above the general cluster line represent positive outliers with superior match conversion rates.</div></div>''', unsafe_allow_html=True)
 
+with tab5, profiler.section("tab: Players"):
+    with profiler.section("player_stats"): player_table = snapshot.player_stats(filtered_df)
+    min_apps = st.number_input("Minimum Appearances", min_value=1, value=10, step=1)
+    qualified = player_table[player_table['Appearances'] >= min_apps]
+    pl_col1, pl_col2 = st.columns([1, 1])
+    with pl_col1, profiler.section("Most Appearances"):
+        st.markdown("### Most Appearances")
+        top_apps = qualified.sort_values('Appearances', ascending=False, kind='stable').head(10)
+        fig_apps = px.bar(top_apps, x='Appearances', y='Player', orientation='h', color='Team Win Rate (%)', color_continuous_scale='Blues')
+        fig_apps.update_layout(yaxis={'categoryorder':'total ascending'}, plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
+        st.plotly_chart(fig_apps, use_container_width=True)
+    with pl_col2, profiler.section("POTM Conversion"):
+        st.markdown("### POTM Conversion")
+        top_potm = qualified.sort_values('POTM Conversion (%)', ascending=False, kind='stable').head(10)
+        fig_potm = px.bar(top_potm, x='POTM Conversion (%)', y='Player', orientation='h', color='POTM Awards', color_continuous_scale='Purples', hover_data=['Appearances'])
+        fig_potm.update_layout(yaxis={'categoryorder':'total ascending'}, plot_bgcolor='white', paper_bgcolor='white', font=dict(family="Plus Jakarta Sans", color="#334155"), margin=dict(l=10, r=10, t=30, b=10))
+        st.plotly_chart(fig_potm, use_container_width=True)
+
+    st.markdown("### Player Records")
+    st.dataframe(qualified.sort_values('Appearances', ascending=False, kind='stable').round(1), use_container_width=True, hide_index=True)
+    st.markdown('''<div class="insight-card"><div class="insight-icon">👤</div><div class="insight-content"><span class="insight-title">Player Impact Observations</span>Appearances measure squad continuity, while the team win rate while playing shows how often a player's presence coincides with a result. POTM conversion isolates match-winning influence: a high award rate over a meaningful number of appearances marks players who repeatedly decide games rather than simply feature in winning sides.</div></div>''', unsafe_allow_html=True)
+
+if profiler.enabled:
+    with st.expander("🛠️ Performance Profile", expanded=False):
+        report = profiler.report()
+        st.caption(f"Rerun time up to this panel: {report['total_ms']:,.1f} ms")
+        st.dataframe(pd.DataFrame(list(report['sections'].items()), columns=['Section', 'ms']).sort_values('ms', ascending=False), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame(list(report['cache'].items()), columns=['Cached Function', 'Result']), use_container_width=True, hide_index=True)
+        st.download_button(label="📥 Export Profile as JSON", data=profiler.to_json(), file_name="ipl_profile.json", mime="application/json", on_click="ignore")
+
 # === END OF FILE ===
@@ -0,0 +1,46 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+def mark_cache_miss():
+    """Call first thing inside a cached function: its body only runs when the cache missed."""
+    _local.missed = True
+
+
+class Profiler:
+    """Wall-clock milliseconds per named section and hit/miss per cached call; every method is a no-op when disabled."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.sections, self.cache = {}, {}
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try: yield
+        finally: self.sections[name] = self.sections.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def cached(self, name):
+        """Time a call to a st.cache_data/st.cache_resource function and record whether its body ran."""
+        _local.missed = False
+        with self.section(name): yield
+        if self.enabled: self.cache[name] = 'miss' if _local.missed else 'hit'
+
+    def report(self):
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'sections': {name: round(ms, 3) for name, ms in self.sections.items()},
+            'cache': dict(self.cache),
+        }
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=2)